@@ -18,7 +18,7 @@ mkdir -p trials
 for GRID in "${GRID_SIZES[@]}"; do
     for ROBOTS in "${ROBOT_COUNTS[@]}"; do
         for VICTIMS in "${VICTIM_COUNTS[@]}"; do
-            FILENAME="${ROBOTS}_${VICTIMS}_${GRID}.bin"
+            FILENAME="${ROBOTS}_${VICTIMS}_${GRID}.npy"
             echo "Generating $FILENAME..."
             python3 "$MAP_GENERATOR" -s "$GRID" -o "$OBSTACLES" -v "$VICTIMS" -b "$ROBOTS" -f "trials/$FILENAME"
         done
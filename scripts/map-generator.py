@@ -1,43 +1,34 @@
 import argparse
 import numpy as np
-import random
-import time
 
 
 def generate_map(rows, cols, num_obstacles, num_victims, num_robots, seed=None):
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-
-    grid = np.zeros((rows, cols), dtype=np.int8)
-
-    # Place obstacles
-    grid = place_at(grid, 1, num_obstacles, rows, cols)
+    if num_obstacles + num_victims + num_robots > rows * cols:
+        raise ValueError(
+            "Total number of obstacles, victims, and robots exceeds grid size."
+        )
 
-    # Place victims
-    grid = place_at(grid, 2, num_victims, rows, cols)
+    rng = np.random.default_rng(seed)
 
-    # Place robots
-    grid = place_at(grid, 3, num_robots, rows, cols)
+    grid = np.zeros((rows, cols), dtype=np.int8)
+    flat = grid.ravel()
 
-    return grid
+    # Shuffle all cells once and hand out consecutive blocks of the permutation
+    idx = rng.permutation(rows * cols)[: num_obstacles + num_victims + num_robots]
+    obstacles, victims, robots = np.split(
+        idx, [num_obstacles, num_obstacles + num_victims]
+    )
 
+    flat[obstacles] = 1
+    flat[victims] = 2
+    flat[robots] = 3
 
-def place_at(grid, at, num, rows, cols):
-    count = 0
-    while count < num:
-        r, c = random.randint(0, rows - 1), random.randint(0, cols - 1)
-        if grid[r, c] == 0:
-            grid[r, c] = at
-            count += 1
     return grid
 
 
-def save_map_to_file(grid, rows, cols, filename):
-    with open(filename, "wb") as f:
-        f.write(rows.to_bytes(1, byteorder="little"))
-        f.write(cols.to_bytes(1, byteorder="little"))
-        grid.tofile(f)
+def save_map_to_file(grid, filename):
+    # The .npy header carries the dtype and shape of the grid
+    np.save(filename, grid)
 
 
 parser = argparse.ArgumentParser(
@@ -59,7 +50,10 @@ parser.add_argument(
 parser.add_argument("-v", "--victims", type=int, default=20, help="Number of victims")
 parser.add_argument("-b", "--robots", type=int, default=5, help="Number of robots")
 parser.add_argument(
-    "-f", "--filename", type=str, default="generated_map.bin", help="Output filename"
+    "-f", "--filename", type=str, default="generated_map.npy", help="Output filename"
+)
+parser.add_argument(
+    "--seed", type=int, default=None, help="Seed for the random placement"
 )
 args = parser.parse_args()
 
@@ -86,7 +80,7 @@ if __name__ == "__main__":
         )
 
     grid = generate_map(
-        rows, cols, num_obstacles, num_victims, num_robots, seed=int(time.time())
+        rows, cols, num_obstacles, num_victims, num_robots, seed=args.seed
     )
-    save_map_to_file(grid, rows, cols, filename)
+    save_map_to_file(grid, filename)
     print(f"Map generated and saved to '{filename}'")
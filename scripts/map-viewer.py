@@ -14,6 +14,9 @@ OBSTACLE = 1
 VICTIM = 2
 ROBOT = 3
 
+# Cell colors indexed by cell type
+PALETTE = np.array([WHITE, BLACK, RED, BLUE], dtype=np.uint8)
+
 
 # --- Argument Parsing ---
 def parse_args():
@@ -22,18 +25,16 @@ def parse_args():
         "-f",
         "--filename",
         type=str,
-        default="generated_map.bin",
-        help="Path to the binary map file",
+        default="generated_map.npy",
+        help="Path to the .npy map file",
     )
     return parser.parse_args()
 
 
 # --- Map Loader ---
 def load_map(filename):
-    with open(filename, "rb") as f:
-        rows = int.from_bytes(f.read(1), byteorder="little")
-        cols = int.from_bytes(f.read(1), byteorder="little")
-        grid = np.fromfile(f, dtype=np.int8).reshape((rows, cols))
+    grid = np.load(filename, mmap_mode="r")
+    rows, cols = grid.shape
     print(f"Loaded map: {rows}x{cols}")
     return grid
 
@@ -41,15 +42,16 @@ def load_map(filename):
 # --- Grid Drawer ---
 def draw_grid(surface, grid):
     rows, cols = grid.shape
-    for r in range(rows):
-        for c in range(cols):
-            color = {OBSTACLE: BLACK, VICTIM: RED, ROBOT: BLUE}.get(grid[r, c], WHITE)
-            pygame.draw.rect(
-                surface, color, (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            )
-            pygame.draw.rect(
-                surface, GRAY, (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1
-            )
+    # Scale every cell up to a GRID_SIZE square of its color
+    pixels = PALETTE[grid].repeat(GRID_SIZE, axis=0).repeat(GRID_SIZE, axis=1)
+
+    # Cell borders sit on the first and last pixel of each cell
+    y = np.arange(rows * GRID_SIZE) % GRID_SIZE
+    x = np.arange(cols * GRID_SIZE) % GRID_SIZE
+    pixels[(y == 0) | (y == GRID_SIZE - 1), :] = GRAY
+    pixels[:, (x == 0) | (x == GRID_SIZE - 1)] = GRAY
+
+    pygame.surfarray.blit_array(surface, pixels.swapaxes(0, 1))
 
 
 # --- Main ---
@@ -63,14 +65,15 @@ def main():
     pygame.display.set_caption("Map Viewer")
     clock = pygame.time.Clock()
 
+    # The map never changes, so render it once up front
+    draw_grid(win, grid)
+
     running = True
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
-        win.fill(WHITE)
-        draw_grid(win, grid)
         pygame.display.update()
         clock.tick(60)
 
@@ -11,17 +11,17 @@ LOG_DIR="logs/$ARGV_1"
 # Ensure log directory exists
 mkdir -p "$LOG_DIR"
 
-# Loop through all .bin map files and run them in parallel
-for MAP_FILE in "$MAP_DIR"/*.bin; do
+# Loop through all .npy map files and run them in parallel
+for MAP_FILE in "$MAP_DIR"/*.npy; do
     # do three times
     for i in {1..3}; do
-        BASENAME=$(basename "$MAP_FILE" .bin)
+        BASENAME=$(basename "$MAP_FILE" .npy)
         LOG_FILE="$LOG_DIR/${BASENAME}_$i.log"
         
         echo "Running $MAP_FILE -> $LOG_FILE"
 
         # Run the simulator in background, redirecting stdout to log
-        python "$SIMULATOR" -f "$MAP_FILE" > "$LOG_FILE"
+        python "$SIMULATOR" -f "$MAP_FILE" --headless > "$LOG_FILE"
     done
 done
 
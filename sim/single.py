@@ -1,9 +1,10 @@
 # --- Imports ---
 import argparse  # For parsing command-line arguments
 import pygame  # For GUI and visualization
-import random  # For randomizing robot movement
+import itertools  # For precomputing movement orders
 import numpy as np  # For efficient matrix/grid manipulation
-from collections import deque  # For BFS queue
+from collections import deque  # For the planned path
+from numba import njit  # For compiling the BFS to native code
 
 # --- Constants ---
 FPS = 30  # Frames per second for the simulation
@@ -28,110 +29,255 @@ OBSTACLE = 1  # Wall or obstacle
 VICTIM = 2  # Person to rescue
 ROBOT = 3  # Starting location of a robot
 
+# Cell colors indexed by cell type (robots are drawn separately)
+PALETTE = np.array([WHITE, BLACK, RED, WHITE], dtype=np.uint8)
+
+# BFS neighbor order (up, down, left, right)
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Neighbor offsets a robot moves by (down, up, right, left), and every order
+# in which it can try them
+MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+MOVE_ORDERS = tuple(
+    tuple(MOVES[i] for i in order) for order in itertools.permutations(range(4))
+)
+
 
 # --- Argument Parsing ---
 def parse_args():
-    # Get filename from command-line argument
+    # Get filename and seed from command-line arguments
     parser = argparse.ArgumentParser(description="Rescue Robot Simulation")
     parser.add_argument(
-        "-f", "--filename", type=str, default="generated_map.bin", help="Input filename"
+        "-f", "--filename", type=str, default="generated_map.npy", help="Input filename"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for robot movement (optional)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--ticks-per-frame",
+        type=int,
+        default=1,
+        help="Simulation ticks to run between rendered frames",
+    )
+    parser.add_argument(
+        "--headless", action="store_true", help="Run without a window"
+    )
+    args = parser.parse_args()
+    if args.ticks_per_frame < 1:
+        parser.error("--ticks-per-frame must be at least 1")
+    return args
 
 
 # --- Utilities ---
 def load_map(filename):
-    # Load binary-encoded map from file
-    with open(filename, "rb") as f:
-        rows = int.from_bytes(f.read(1), byteorder="little")
-        cols = int.from_bytes(f.read(1), byteorder="little")
-        grid = np.fromfile(f, dtype=np.int8).reshape((rows, cols))
+    # Map the .npy file copy-on-write so rescued victims never reach the file
+    grid = np.load(filename, mmap_mode="c")
+    rows, cols = grid.shape
     print(f"Loaded map: {rows}x{cols}")
     return grid
 
 
-def draw_grid(surface, grid):
-    surface.fill(WHITE)
+def cell_borders(shape):
+    # Pixel mask of the 1px border around every cell (first and last pixel)
+    rows, cols = shape
+    y = np.arange(rows * GRID_SIZE) % GRID_SIZE
+    x = np.arange(cols * GRID_SIZE) % GRID_SIZE
+    y_edge = (y == 0) | (y == GRID_SIZE - 1)
+    x_edge = (x == 0) | (x == GRID_SIZE - 1)
+    return y_edge[:, None] | x_edge[None, :]
 
-    # Draw the full grid, showing walls and victims
-    rows, cols = grid.shape
-    for r in range(rows):
-        for c in range(cols):
-            color = {OBSTACLE: BLACK, VICTIM: RED}.get(
-                grid[r, c], WHITE
-            )  # Black for obstacle, red for victim
-            pygame.draw.rect(
-                surface, color, (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            )
-            pygame.draw.rect(
-                surface, GRAY, (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1
-            )
+
+def circle_mask(radius):
+    # Pixels covered by a circle drawn in the middle of a single cell
+    cell = pygame.Surface((GRID_SIZE, GRID_SIZE))
+    pygame.draw.circle(cell, WHITE, (GRID_SIZE // 2, GRID_SIZE // 2), radius)
+    return pygame.surfarray.array_red(cell).T > 0
+
+
+def cell_pixels(pixels, r, c):
+    # View of the pixels belonging to cell (r, c)
+    y, x = r * GRID_SIZE, c * GRID_SIZE
+    return pixels[y : y + GRID_SIZE, x : x + GRID_SIZE]
+
+
+def render_cells(pixels, colors, borders):
+    # Scale one color per cell up into the frame in place, then add the
+    # gray cell borders, which are drawn over every layer
+    rows, cols = colors.shape[:2]
+    pixels.reshape(rows, GRID_SIZE, cols, GRID_SIZE, 3)[...] = colors[
+        :, None, :, None
+    ]
+    pixels[borders] = GRAY
+
+
+def repaint_cells(pixels, colors, shown, stale):
+    # Repaint only the cells whose color changed since the last frame, plus
+    # the stale cells (robots were stamped over them)
+    changed = (colors != shown).any(axis=2)
+    for r, c in stale:
+        changed[r, c] = True
+    for r, c in np.argwhere(changed).tolist():
+        cell = cell_pixels(pixels, r, c)
+        cell[...] = colors[r, c]
+        cell[cell_border] = GRAY
+    np.copyto(shown, colors)
+
+
+def draw_cell(colors, grid, r, c):
+    # Repaint a single cell, e.g. after its victim has been rescued
+    colors[r, c] = PALETTE[grid[r, c]]
+
+
+def blend(colors, overlay):
+    # Alpha-blend an RGBA overlay into RGB colors the way pygame blits do
+    mask = overlay[..., 3] > 0
+    src = overlay[mask].astype(np.int32)
+    dst = colors[mask].astype(np.int32)
+    alpha = src[:, 3:]
+    colors[mask] = dst + (((src[:, :3] - dst) * alpha + src[:, :3]) >> 8)
 
 
 def draw_timer(surface, ticks, rows):
-    # Draw the timer showing how many ticks have passed
-    font = pygame.font.SysFont(None, 24)
-    surface.blit(font.render(f"Ticks: {ticks}", True, BLACK), (5, rows * GRID_SIZE + 5))
+    # Draw the timer showing how many ticks have passed, only the number is
+    # rendered per frame
+    width, height = surface.get_size()
+    top = rows * GRID_SIZE
+    surface.fill(WHITE, (0, top, width, height - top))
+    surface.blit(TIMER_LABEL, (5, top + 5))
+    surface.blit(
+        TIMER_FONT.render(str(ticks), True, BLACK),
+        (5 + TIMER_LABEL.get_width(), top + 5),
+    )
+
+
+# --- Pathfinding ---
+@njit(cache=True)
+def bfs(known, frontier, sr, sc, stamps, came_from, queue, generation):
+    # Find the nearest UNKNOWN cell, storing the direction each cell was
+    # entered from instead of copying the whole path on every push. The
+    # search stops at the first frontier cell, whose first UNKNOWN neighbor
+    # is the cell a search that waits to dequeue an UNKNOWN cell would return.
+    # The buffers are reused across searches: a cell is visited when its
+    # stamp equals this search's generation, so nothing is cleared up front.
+    rows, cols = known.shape
+    start = sr * cols + sc
+    steps = np.array((-cols, cols, -1, 1))  # Flat index offset of each direction
+    stamps[start] = generation
+    queue[0] = start
+    head, tail = 0, 1
+
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        r, c = idx // cols, idx % cols
+
+        if frontier[r, c]:
+            # Found it, step into the UNKNOWN cell and walk back to the start
+            for d in range(len(DIRECTIONS)):
+                nr, nc = r + DIRECTIONS[d][0], c + DIRECTIONS[d][1]
+                if 0 <= nr < rows and 0 <= nc < cols and known[nr, nc] == UNKNOWN:
+                    idx = nr * cols + nc
+                    came_from[idx] = d
+                    break
+            length = 0
+            i = idx
+            while i != start:
+                length += 1
+                i -= steps[came_from[i]]
+            path = np.empty((length, 2), np.int32)
+            i = idx
+            for k in range(length - 1, -1, -1):
+                path[k, 0], path[k, 1] = i // cols, i % cols
+                i -= steps[came_from[i]]
+            return path
+
+        for d in range(len(DIRECTIONS)):
+            nr, nc = r + DIRECTIONS[d][0], c + DIRECTIONS[d][1]
+            if 0 <= nr < rows and 0 <= nc < cols:
+                nidx = nr * cols + nc
+                if stamps[nidx] != generation:
+                    tile = known[nr, nc]
+                    if tile != OBSTACLE and tile != VICTIM:
+                        stamps[nidx] = generation
+                        came_from[nidx] = d
+                        queue[tail] = nidx
+                        tail += 1
+
+    return np.empty((0, 2), np.int32)  # No path found
+
+
+@njit(cache=True)
+def update_frontier(known, frontier, r, c):
+    # Recompute the frontier (known, passable cells next to an UNKNOWN cell)
+    # around (r, c), covering every cell a reveal there can affect
+    rows, cols = known.shape
+    for fr in range(max(r - 2, 0), min(r + 3, rows)):
+        for fc in range(max(c - 2, 0), min(c + 3, cols)):
+            tile = known[fr, fc]
+            edge = False
+            if tile != UNKNOWN and tile != OBSTACLE and tile != VICTIM:
+                for dr, dc in DIRECTIONS:
+                    nr, nc = fr + dr, fc + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and known[nr, nc] == UNKNOWN:
+                        edge = True
+            frontier[fr, fc] = edge
+
+
+@njit(cache=True)
+def reveal(known, frontier, grid, r, c):
+    # Copy the true type of every UNKNOWN neighbor of (r, c) into the known
+    # map and mark (r, c) traversed. Stepping from one known passable cell to
+    # another changes no frontier, so most steps skip the frontier update.
+    rows, cols = known.shape
+    changed = known[r, c] != FREE and known[r, c] != TRAVERSED
+    for dr, dc in DIRECTIONS:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols and known[nr, nc] == UNKNOWN:
+            known[nr, nc] = grid[nr, nc]
+            changed = True
+    known[r, c] = TRAVERSED
+    if changed:
+        update_frontier(known, frontier, r, c)
 
 
 # --- Robot Class ---
 class RescueRobot:
-    def __init__(self, start_pos, map_shape):
+    # Fixed attributes, stored in slots rather than a per-instance dict
+    __slots__ = ("pos", "path", "known_map", "frontier")
+
+    def __init__(self, start_pos, map_shape, known_map, frontier):
         self.pos = tuple(start_pos)  # Current position
-        self.path = []  # Path to follow
-        self.known_map = np.full(
-            map_shape, UNKNOWN, dtype=np.int8
-        )  # Map the robot builds over time
+        self.path = deque()  # Path to follow
+        self.known_map = known_map  # Map the robot builds over time
+        self.frontier = frontier  # Known, passable cells next to an UNKNOWN one
         self.update_known_map()  # Explore surroundings initially
 
     def update_known_map(self):
         # Update the robot’s known map based on current position
-        r, c = self.pos
-        self.known_map[r][c] = TRAVERSED
-        for nr, nc in [
-            (r + 1, c),
-            (r - 1, c),
-            (r, c + 1),
-            (r, c - 1),
-        ]:  # Up, Down, Left, Right
-            if (
-                0 <= nr < self.known_map.shape[0]
-                and 0 <= nc < self.known_map.shape[1]
-                and self.known_map[nr][nc] == UNKNOWN
-            ):
-                self.known_map[nr][nc] = grid[nr][nc]  # Reveal cell value
+        reveal(self.known_map, self.frontier, grid, *self.pos)
 
     def bfs_to_unexplored(self):
-        rows, cols = self.known_map.shape
-        visited = set()
-        queue = deque()
-        queue.append((self.pos, []))  # (current_pos, path_so_far)
-        visited.add(self.pos)
-
-        while queue:
-            (r, c), path = queue.popleft()
-
-            if self.known_map[r][c] == UNKNOWN:
-                return path  # Found it, return path to this UNKNOWN
-
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                next_pos = (nr, nc)
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    if next_pos not in visited:
-                        tile = self.known_map[nr][nc]
-                        if tile != OBSTACLE and tile != VICTIM:
-                            visited.add(next_pos)
-                            queue.append((next_pos, path + [next_pos]))
-
-        return []  # No path found
+        # Path as a list of (row, col) tuples, excluding the current position
+        global bfs_generation
+        bfs_generation += 1
+        path = bfs(
+            self.known_map,
+            self.frontier,
+            *self.pos,
+            bfs_stamps,
+            bfs_came_from,
+            bfs_queue,
+            bfs_generation,
+        )
+        return [tuple(p) for p in path.tolist()]
 
     def move(self):
         # Main decision logic for robot movement
+        global victims_left
 
         # If following a planned path, continue
         if self.path:
-            next = self.path.pop(0)
+            next = self.path.popleft()
 
             self.pos = next
             self.update_known_map()
@@ -140,153 +286,167 @@ class RescueRobot:
             # check if next next cell is valid (not an obstacle nor victim)
             # if not, remove it from the path
             if next_next:
-                at_next = self.known_map[next_next[0]][next_next[1]]
+                at_next = self.known_map[next_next]
                 if at_next == VICTIM or at_next == OBSTACLE:
-                    self.path.pop(0)
+                    self.path.popleft()
 
             return
 
         r, c = self.pos
-        options = [(r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)]
-        random.shuffle(options)  # Randomize movement direction
+        known = self.known_map
+        rows, cols = known.shape
+        # Neighbors in a random order, bounds checked once
+        options = [
+            (r + dr, c + dc)
+            for dr, dc in MOVE_ORDERS[rng.integers(len(MOVE_ORDERS))]
+            if 0 <= r + dr < rows and 0 <= c + dc < cols
+        ]
 
         # Priority 1: Rescue nearby victim
         for nr, nc in options:
-            if 0 <= nr < rows and 0 <= nc < cols:
-                if self.known_map[nr][nc] == VICTIM:
-                    self.pos = (nr, nc)
-                    victim_positions.discard((nr, nc))  # Remove victim from global set
-                    grid[nr][nc] = 0  # Mark as cleared
-                    self.update_known_map()
-                    return
+            if known[nr, nc] == VICTIM:
+                self.pos = (nr, nc)
+                # Another robot may have rescued this victim already
+                if grid[nr, nc] == VICTIM:
+                    victims_left -= 1
+                    grid[nr, nc] = FREE  # Mark as cleared
+                    draw_cell(background, grid, nr, nc)
+                self.update_known_map()
+                return
 
         # Priority 2: Move to adjacent known free cell
         for nr, nc in options:
-            if 0 <= nr < rows and 0 <= nc < cols and self.known_map[nr][nc] == FREE:
+            if known[nr, nc] == FREE:
                 self.pos = (nr, nc)
                 self.update_known_map()
                 return
 
-        # Priority 3: Find path to nearest unexplored cell
-        path = self.bfs_to_unexplored()
+        # Priority 3: Find path to nearest unexplored cell. Without frontier
+        # cells no UNKNOWN cell is reachable, so skip the exhaustive search.
+        path = self.bfs_to_unexplored() if self.frontier.any() else []
         if path and len(path) > 1:
-            self.path = path[1:]
+            self.path = deque(path[1:])
             self.move()
             return
 
         # Priority 4: Go back to traversed cell if stuck
         for nr, nc in options:
-            if (
-                0 <= nr < rows
-                and 0 <= nc < cols
-                and self.known_map[nr][nc] == TRAVERSED
-            ):
+            if known[nr, nc] == TRAVERSED:
                 self.pos = (nr, nc)
                 self.update_known_map()
                 return
 
-    def draw_known_map(self, surface):
+    def draw_known_map(self, colors):
         # Adjust transparency based on number of robots, minimum 50
         transparency = max(255 // len(robots), 75)
         # Show what the robot has discovered so far
-        for r in range(self.known_map.shape[0]):
-            for c in range(self.known_map.shape[1]):
-                block = self.known_map[r][c]
-                if block == TRAVERSED:
-                    color = (255, 255, 0, transparency)  # Yellow with transparency
-                elif block == FREE:
-                    color = (0, 255, 0, transparency)  # Green with transparency
-                else:
-                    continue
-                pygame.draw.rect(
-                    surface, color, (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                )
-                pygame.draw.rect(
-                    surface,
-                    GRAY,
-                    (c * GRID_SIZE, r * GRID_SIZE, GRID_SIZE, GRID_SIZE),
-                    1,
-                )
-
-    def draw(self, surface):
+        overlay = np.zeros(self.known_map.shape + (4,), dtype=np.uint8)
+        overlay[self.known_map == TRAVERSED] = (255, 255, 0, transparency)  # Yellow
+        overlay[self.known_map == FREE] = (0, 255, 0, transparency)  # Green
+        blend(colors, overlay)
+
+    def draw(self, pixels):
         # Draw robot as a blue circle
         r, c = self.pos
-        pygame.draw.circle(
-            surface,
-            BLUE,
-            (c * GRID_SIZE + GRID_SIZE // 2, r * GRID_SIZE + GRID_SIZE // 2),
-            GRID_SIZE // 3,
-        )
+        cell = cell_pixels(pixels, r, c)
+        cell[robot_sprite] = BLUE
 
 
 # --- Initialization ---
 args = parse_args()
+rng = np.random.default_rng(args.seed)  # Single source of randomness
 grid = load_map(args.filename)
 rows, cols = grid.shape
 
-# Set up Pygame window
-window_size = (cols * GRID_SIZE, rows * GRID_SIZE + 30)
-pygame.init()
-pygame.display.set_caption("Rescue Robot Simulation")
-win = pygame.display.set_mode(window_size)
-clock = pygame.time.Clock()
-
-robots = []  # List of robots
-victim_positions = set()  # Track all victim positions
-
-# Populate grid with robots and victims
-for r in range(rows):
-    for c in range(cols):
-        if grid[r][c] == VICTIM:
-            victim_positions.add((r, c))
-        elif grid[r][c] == ROBOT:
-            robots.append(RescueRobot((r, c), (rows, cols)))
+# Set up Pygame window, unless running headless
+if not args.headless:
+    window_size = (cols * GRID_SIZE, rows * GRID_SIZE + 30)
+    pygame.init()
+    pygame.display.set_caption("Rescue Robot Simulation")
+    win = pygame.display.set_mode(window_size)
+    clock = pygame.time.Clock()
+    TIMER_FONT = pygame.font.SysFont(None, 24)
+    TIMER_LABEL = TIMER_FONT.render("Ticks: ", True, BLACK)
+
+# Obstacles never move, so cell colors are looked up once and patched on rescues
+background = PALETTE[grid]
+cell_border = cell_borders((1, 1))
+robot_sprite = circle_mask(GRID_SIZE // 3)
+
+victims_left = int(np.count_nonzero(grid == VICTIM))  # Victims still on the map
+
+# BFS buffers shared by all robots, which search one at a time
+bfs_stamps = np.zeros(rows * cols, dtype=np.int32)  # Generation that visited a cell
+bfs_came_from = np.empty(rows * cols, dtype=np.uint8)  # Direction a cell was entered
+bfs_queue = np.empty(rows * cols, dtype=np.int32)  # Every cell is queued at most once
+bfs_generation = 0
+
+# Every robot gets its own layer of one contiguous known map allocation
+robot_starts = np.argwhere(grid == ROBOT).tolist()
+known_maps = np.full((len(robot_starts), rows, cols), UNKNOWN, dtype=np.int8)
+frontiers = np.zeros(known_maps.shape, dtype=np.bool_)
+
+# Place a robot on every starting cell
+robots = [
+    RescueRobot(pos, (rows, cols), known_maps[i], frontiers[i])
+    for i, pos in enumerate(robot_starts)
+]
 
 
 # --- Main Loop ---
 def main():
     ticks = 0
     run = True
-    overlays = []
-
-    # Create len(robots) overlays for each robot
-    for _ in range(len(robots)):
-        overlay = pygame.Surface(win.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 0))
-        overlays.append(overlay)
+    if not args.headless:
+        colors = np.empty_like(background)  # One color per cell, composed every tick
+        shown = background.copy()  # Cell colors currently in the frame
+        frame = np.empty((rows * GRID_SIZE, cols * GRID_SIZE, 3), dtype=np.uint8)
+        render_cells(frame, shown, cell_borders(grid.shape))
+        # The surface wraps the frame's memory, so it is built once and every
+        # later write to the frame shows up in it without a copy
+        frame_surface = pygame.image.frombuffer(
+            frame, (cols * GRID_SIZE, rows * GRID_SIZE), "RGB"
+        )
+        drawn = []  # Cells the robots were stamped on last frame
 
     while run:
-        # Handle quitting
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        if not args.headless:
+            # Handle quitting
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    run = False
+
+            np.copyto(colors, background)
+
+            # Draw each robot’s known map overlay
+            for robot in robots:
+                robot.draw_known_map(colors)
+
+            repaint_cells(frame, colors, shown, drawn)
+
+            # Draw each robot
+            for robot in robots:
+                robot.draw(frame)
+            drawn = [robot.pos for robot in robots]
+
+            # Hand the finished map area to pygame in a single blit
+            win.blit(frame_surface, (0, 0))
+            draw_timer(win, ticks, rows)
+            pygame.display.update()
+            clock.tick(FPS)
+
+        # Advance the simulation by several ticks per rendered frame
+        for _ in range(args.ticks_per_frame):
+            # Move all robots
+            for robot in robots:
+                robot.move()
+            ticks += 1
+
+            # Check if all victims are rescued
+            if victims_left == 0:
+                print("All victims rescued!")
                 run = False
-
-        draw_grid(win, grid)
-
-        # Draw each robot’s known map overlay
-        for i, robot in enumerate(robots):
-            overlay = overlays[i]
-            robot.draw_known_map(overlay)
-            win.blit(overlay, (0, 0))
-
-        # Draw each robot
-        for robot in robots:
-            robot.draw(win)
-
-        draw_timer(win, ticks, rows)
-        pygame.display.update()
-        clock.tick(FPS)
-
-        # Move all robots
-        for robot in robots:
-            robot.move()
-
-        # Check if all victims are rescued
-        if not victim_positions:
-            print("All victims rescued!")
-            run = False
-
-        ticks += 1
+                break
 
     print(f"Simulation finished in {ticks} ticks.")
     pygame.quit()